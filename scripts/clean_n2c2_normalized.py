@@ -1,6 +1,8 @@
 import os, re, pandas as pd
 import glob
 
+from pipeline_io import CSV_READ_KWARGS, write_parquet_cache
+
 
 script_dir = os.path.dirname(os.path.abspath(__file__))
 data_dir = os.path.join(script_dir, "..", "data", "n2c2", "processed")
@@ -9,22 +11,22 @@ data_dir = os.path.join(script_dir, "..", "data", "n2c2", "processed")
 input_file = os.path.join(data_dir, "n2c2_normalized.csv")
 output_file = os.path.join(data_dir, "n2c2_clean.csv")
 
-# Read the CSV
-df = pd.read_csv(input_file)
+# Read the CSV (only the columns used below)
+string_cols = ["drug_matched", "drug_normalized", "ade_matched", "ade_normalized", "source_file"]
+df = pd.read_csv(input_file, usecols=string_cols,
+                 dtype=dict.fromkeys(string_cols, "string"), **CSV_READ_KWARGS)
 
 # Create new columns with priority logic:
 # use matched if available, else normalized
-df["drug_norm"] = df["drug_matched"].fillna(df["drug_normalized"])
-df["ade_norm"] = df["ade_matched"].fillna(df["ade_normalized"])
-
-# In some cases, there may be empty strings instead of NaN
-df["drug_norm"] = df["drug_norm"].replace("", pd.NA).fillna(df["drug_normalized"])
-df["ade_norm"] = df["ade_norm"].replace("", pd.NA).fillna(df["ade_normalized"])
+# (in some cases, there may be empty strings instead of NaN)
+df["drug_norm"] = df["drug_matched"].replace("", pd.NA).fillna(df["drug_normalized"])
+df["ade_norm"] = df["ade_matched"].replace("", pd.NA).fillna(df["ade_normalized"])
 
 # Keep only required columns
 result_df = df[["drug_norm", "ade_norm", "source_file"]]
 
 # Save to new CSV
 result_df.to_csv(output_file, index=False)
+write_parquet_cache(result_df, output_file)
 
 print(f"New file saved as: {output_file}")
@@ -1,31 +1,37 @@
-import os, re, pandas as pd
+import os, pandas as pd
 import glob
+from concurrent.futures import ProcessPoolExecutor
+
+ENTITY_COLUMNS = ["entity_id", "label", "text", "source_file"]
+RELATION_COLUMNS = ["rel_id", "relation", "arg1", "arg2", "source_file"]
 
 def parse_ann_file(ann_path):
+    # Prefix IDs with the filename to make them globally unique
+    base_name = os.path.splitext(os.path.basename(ann_path))[0]
+    prefix = base_name + '_'
     entities, relations = [], []
     with open(ann_path, 'r', encoding='utf-8') as f:
         for line in f:
             if line.startswith('T'):
                 tid, label_text = line.strip().split('\t', 1)
-                label, start, end, text = re.split(r'\s+', label_text, maxsplit=3)
-                entities.append((tid, label, text))
+                label, start, end, text = label_text.split(None, 3)
+                entities.append((prefix + tid, label, text, base_name))
             elif line.startswith('R'):
                 rid, rest = line.strip().split('\t')
                 rel_type, args = rest.split(' ', 1)
 
-                arg1_match = re.search(r'Arg1:(T\d+)', args)
-                arg2_match = re.search(r'Arg2:(T\d+)', args)
+                # Arguments look like "Arg1:T5 Arg2:T3"
+                arg_map = dict(a.split(':', 1) for a in args.split() if ':' in a)
+                arg1 = arg_map.get('Arg1')
+                arg2 = arg_map.get('Arg2')
 
-                if arg1_match and arg2_match:
-                    arg1 = arg1_match.group(1)
-                    arg2 = arg2_match.group(1)
-                    relations.append((rid, rel_type, arg1, arg2))
+                if arg1 and arg2:
+                    relations.append((prefix + rid, rel_type, prefix + arg1, prefix + arg2, base_name))
                 else:
                     # Skip this line or log the error
                     print(f"Skipping malformed relation: {line.strip()}")
                 
-    return pd.DataFrame(entities, columns=["entity_id", "label", "text"]), \
-           pd.DataFrame(relations, columns=["rel_id", "relation", "arg1", "arg2"])
+    return entities, relations
 
 def map_relations():
     
@@ -83,37 +89,28 @@ def n2c2_extract_all():
     all_entities = []
     all_relations = []
     
-    for ann_file in ann_files:
-        print(f"Processing {ann_file}...")
-        entities_df, relations_df = parse_ann_file(ann_file)
-        
-        base_name = os.path.splitext(os.path.basename(ann_file))[0]
+    # Files are independent, so parse them in parallel worker processes;
+    # map() yields results in the same order as ann_files
+    with ProcessPoolExecutor() as executor:
+        results = executor.map(parse_ann_file, ann_files, chunksize=8)
 
-        # Make IDs globally unique by prefixing with filename
-        entities_df['entity_id'] = base_name + '_' + entities_df['entity_id']
-        relations_df['rel_id'] = base_name + '_' + relations_df['rel_id']
-        relations_df['arg1'] = base_name + '_' + relations_df['arg1']
-        relations_df['arg2'] = base_name + '_' + relations_df['arg2']
+        for ann_file, (entities, relations) in zip(ann_files, results):
+            print(f"Processing {ann_file}...")
+            all_entities.extend(entities)
+            all_relations.extend(relations)
 
-        entities_df['source_file'] = base_name
-        relations_df['source_file'] = base_name
+    # Build the combined dataframes once every file has been parsed
+    combined_entities = pd.DataFrame(all_entities, columns=ENTITY_COLUMNS)
+    combined_relations = pd.DataFrame(all_relations, columns=RELATION_COLUMNS)
 
-        all_entities.append(entities_df)
-        all_relations.append(relations_df)
+    filtered_entities = combined_entities[combined_entities['label'].isin(['Drug', 'ADE'])]
 
-        # Concatenate all dataframes
-        combined_entities = pd.concat(all_entities, ignore_index=True)
-        combined_relations = pd.concat(all_relations, ignore_index=True)
+    # Filter relations: keep only ADE-Drug
+    filtered_relations = combined_relations[combined_relations['relation'] == 'ADE-Drug']
 
-        filtered_entities = combined_entities[combined_entities['label'].isin(['Drug', 'ADE'])]
-    
-        # Filter relations: keep only ADE-Drug
-        filtered_relations = combined_relations[combined_relations['relation'] == 'ADE-Drug']
+    filtered_entities.to_csv(os.path.join(output_dir, "n2c2_entities.csv"), index=False)
+    filtered_relations.to_csv(os.path.join(output_dir, "n2c2_relations.csv"), index=False)
 
-        filtered_entities.to_csv(os.path.join(output_dir, "n2c2_entities.csv"), index=False)
-        filtered_relations.to_csv(os.path.join(output_dir, "n2c2_relations.csv"), index=False)
-        
-    
     print(f"Done! Processed {len(ann_files)} files")
     print(f"Total entities (Drug/ADE): {len(filtered_entities)}")
     print(f"Total ADE-Drug relations: {len(filtered_relations)}")
@@ -15,7 +15,8 @@ import argparse
 import pandas as pd
 import numpy as np
 from pathlib import Path
-from collections import defaultdict
+
+from pipeline_io import read_table, to_categorical
 
 
 def load_data(base_path: Path):
@@ -24,87 +25,92 @@ def load_data(base_path: Path):
     sider_path = base_path / 'data' / 'sider' / 'processed'
     
     # Load SIDER frequency data
-    sider_df = pd.read_csv(sider_path / 'sider_clean.csv')
+    sider_df = to_categorical(read_table(sider_path / 'sider_clean.csv', {
+        'drug_norm': 'string', 'ade_norm': 'string', 'frequency': 'int32'
+    }))
+    # Keep one row per SIDER drug-ADE pair, using the highest frequency
+    # recorded for that pair, so lookups and joins cannot multiply rows
+    sider_df = (
+        sider_df
+        .groupby(['drug_norm', 'ade_norm'], as_index=False, observed=True, dropna=False)
+        ['frequency'].max()
+    )
     print(f"Loaded {len(sider_df)} SIDER drug-ADE pairs")
     
     # Load n2c2 validation results
-    n2c2_df = pd.read_csv(n2c2_path / 'n2c2_with_sider_context.csv')
+    n2c2_df = to_categorical(read_table(n2c2_path / 'n2c2_with_sider_context.csv', {
+        'drug_norm': 'string', 'ade_norm': 'string', 'source_file': 'string',
+        'is_consistent': 'bool', 'sider_match_found': 'bool'
+    }))
     print(f"Loaded {len(n2c2_df)} n2c2 drug-ADE pairs")
     
     return sider_df, n2c2_df
 
 
-def analyze_drug_patterns(n2c2_df: pd.DataFrame) -> dict:
+# Filter reasons indexed by the codes returned from score_ades; the last entry
+# is the only reason for which an ADE is dropped
+FILTER_REASONS = np.array([
+    "high_confidence_sider",
+    "strong_local_signal",
+    "consistent_drug_pattern",
+    "frequent_association",
+    "insufficient_evidence"
+])
+INSUFFICIENT_EVIDENCE = len(FILTER_REASONS) - 1
+
+
+def analyze_drug_patterns(n2c2_df: pd.DataFrame) -> pd.DataFrame:
     """Analyze drug mention patterns to identify consistent ADEs.
     
-    Returns a dict with drug-level statistics to help identify reliable patterns.
+    Returns a DataFrame aligned with n2c2_df holding the drug-level statistics
+    for each row: total_mentions, ade_mentions and sider_validated.
     """
-    drug_patterns = defaultdict(lambda: {
-        'total_mentions': 0,
-        'ades': defaultdict(int),
-        'consistent_ades': set(),
-        'sider_validated': 0
-    })
-    
-    for _, row in n2c2_df.iterrows():
-        drug = row['drug_norm']
-        ade = row['ade_norm']
-        
-        stats = drug_patterns[drug]
-        stats['total_mentions'] += 1 # type: ignore
-        stats['ades'][ade] += 1 # type: ignore
-        
-        if row['is_consistent']:
-            stats['consistent_ades'].add(ade) # type: ignore
-            stats['sider_validated'] += 1 # type: ignore
-    
-    # Convert to regular dict for return
-    return {k: dict(v) for k, v in drug_patterns.items()}
-
-
-def should_keep_ade(
-    row: pd.Series,
-    drug_patterns: dict,
-    sider_freqs: dict,
+    # Integer codes per drug and per drug-ADE pair (missing values get a code too)
+    drug_codes, _ = pd.factorize(n2c2_df['drug_norm'], use_na_sentinel=False)
+    ade_codes, ade_uniques = pd.factorize(n2c2_df['ade_norm'], use_na_sentinel=False)
+    pair_codes, _ = pd.factorize(drug_codes.astype(np.int64) * len(ade_uniques) + ade_codes)
+    is_consistent = n2c2_df['is_consistent'].to_numpy(dtype=bool)
+    
+    # Count per code, then broadcast the counts back to the rows
+    total_mentions = np.bincount(drug_codes)[drug_codes]
+    ade_mentions = np.bincount(pair_codes)[pair_codes]
+    sider_validated = np.bincount(drug_codes, weights=is_consistent)[drug_codes].astype(np.int64)
+    
+    return pd.DataFrame({
+        'total_mentions': total_mentions,
+        'ade_mentions': ade_mentions,
+        'sider_validated': sider_validated
+    }, index=n2c2_df.index)
+
+
+def score_ades(
+    is_consistent: np.ndarray,
+    sider_freq: np.ndarray,
+    total_mentions: np.ndarray,
+    ade_mentions: np.ndarray,
+    sider_validated: np.ndarray,
     min_freq: int = 2,
     consistency_threshold: float = 0.4
-) -> tuple[bool, str]:
-    """Determine if an ADE mention should be kept based on multiple criteria.
+) -> np.ndarray:
+    """Decide, for every ADE mention at once, whether it should be kept.
     
-    Returns:
-    - bool: Whether to keep the ADE
-    - str: Reason for the decision
+    Returns a uint8 array of indices into FILTER_REASONS; the first matching
+    criterion wins.
     """
-    drug = row['drug_norm']
-    ade = row['ade_norm']
-    
-    # Get drug statistics
-    drug_stats = drug_patterns.get(drug, {})
-    total_mentions = drug_stats.get('total_mentions', 0)
-    ade_mentions = drug_stats.get('ades', {}).get(ade, 0)
-    sider_validated = drug_stats.get('sider_validated', 0)
-    
     # Calculate confidence metrics
-    mention_ratio = ade_mentions / total_mentions if total_mentions > 0 else 0
-    sider_consistency = sider_validated / total_mentions if total_mentions > 0 else 0
+    mention_ratio = ade_mentions / total_mentions
+    sider_consistency = sider_validated / total_mentions
     
-    # Check SIDER frequency
-    sider_freq = sider_freqs.get((drug, ade), 0)
+    # Decision logic, evaluated in priority order
+    conditions = [
+        is_consistent & (sider_freq >= min_freq),
+        (mention_ratio >= 0.5) & (ade_mentions >= 2),
+        (sider_consistency >= consistency_threshold) & (ade_mentions >= 2),
+        (total_mentions >= 5) & (mention_ratio >= 0.3)
+    ]
     
-    # Decision logic
-    if row['is_consistent'] and sider_freq >= min_freq:
-        return True, "high_confidence_sider"
-    
-    if mention_ratio >= 0.5 and ade_mentions >= 2:
-        return True, "strong_local_signal"
-        
-    if sider_consistency >= consistency_threshold and ade_mentions >= 2:
-        return True, "consistent_drug_pattern"
-    
-    if total_mentions >= 5 and mention_ratio >= 0.3:
-        return True, "frequent_association"
-    
-    return False, "insufficient_evidence"
+    reason_codes = np.select(conditions, np.arange(len(conditions)), default=INSUFFICIENT_EVIDENCE)
+    return reason_codes.astype(np.uint8)
 
 
 def filter_ades(
@@ -115,33 +121,32 @@ def filter_ades(
 ) -> pd.DataFrame:
     """Filter ADEs based on SIDER frequencies and local patterns."""
     
-    # Build SIDER frequency lookup
-    sider_freqs = {
-        (row['drug_norm'], row['ade_norm']): row['frequency']
-        for _, row in sider_df.iterrows()
-    }
+    # Build SIDER frequency lookup keyed by (drug_norm, ade_norm)
+    sider_freqs = sider_df.set_index(['drug_norm', 'ade_norm'])['frequency']
+    
+    # Look up the SIDER frequency of each drug-ADE pair (0 if not in SIDER)
+    pair_index = pd.MultiIndex.from_frame(n2c2_df[['drug_norm', 'ade_norm']])
+    sider_freq = sider_freqs.reindex(pair_index).fillna(0).to_numpy()
     
     # Analyze drug mention patterns
-    drug_patterns = analyze_drug_patterns(n2c2_df)
-    
-    # Apply filtering
-    keep_rows = []
-    reasons = []
-    
-    for _, row in n2c2_df.iterrows():
-        keep, reason = should_keep_ade(
-            row, 
-            drug_patterns,
-            sider_freqs,
-            min_freq,
-            consistency_threshold
-        )
-        keep_rows.append(keep)
-        reasons.append(reason)
+    patterns = analyze_drug_patterns(n2c2_df)
+    total_mentions = patterns['total_mentions'].to_numpy()
+    ade_mentions = patterns['ade_mentions'].to_numpy()
+    sider_validated = patterns['sider_validated'].to_numpy()
+    
+    reason_codes = score_ades(
+        n2c2_df['is_consistent'].to_numpy(dtype=bool),
+        sider_freq,
+        total_mentions,
+        ade_mentions,
+        sider_validated,
+        min_freq,
+        consistency_threshold
+    )
     
     # Add decision columns
-    n2c2_df['kept'] = keep_rows
-    n2c2_df['filter_reason'] = reasons
+    n2c2_df['kept'] = reason_codes != INSUFFICIENT_EVIDENCE
+    n2c2_df['filter_reason'] = FILTER_REASONS[reason_codes]
     
     return n2c2_df
 
@@ -155,7 +160,7 @@ def write_reports(filtered_df: pd.DataFrame, output_dir: Path):
     # Write main filtered results
     filtered_df.to_csv(output_dir / 'ade_filtered_results.csv', index=False)
     
-    # Generate summary by reason
+    # Generate summary by reason (counts and sums are already integers)
     reason_summary = (
         filtered_df
         .groupby('filter_reason')
@@ -163,20 +168,18 @@ def write_reports(filtered_df: pd.DataFrame, output_dir: Path):
             'drug_norm': 'count',
             'kept': 'sum'
         })
-        .round(2)
     )
     reason_summary.to_csv(output_dir / 'filter_reason_summary.csv')
     
     # Generate drug-level summary
     drug_summary = (
         filtered_df
-        .groupby('drug_norm')
+        .groupby('drug_norm', observed=True)
         .agg({
             'ade_norm': 'count',
             'is_consistent': 'sum',
             'kept': 'sum'
         })
-        .round(2)
     )
     drug_summary.to_csv(output_dir / 'drug_summary.csv')
     
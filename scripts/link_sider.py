@@ -5,6 +5,21 @@ import numpy as np
 from pathlib import Path
 from datetime import datetime
 
+from pipeline_io import read_table, to_categorical, write_parquet_cache
+
+def normalize_keys(values, na_value):
+    """
+    Lowercase and strip a key column, returning it as a categorical.
+    Only the distinct values are normalized; rows are remapped by their codes,
+    and missing values become na_value.
+    """
+    values = values.astype('category')
+    normalized = values.cat.categories.astype(str).str.lower().str.strip()
+    # The trailing na_value is picked up by the -1 code of missing rows
+    code_map, uniques = pd.factorize(np.append(normalized.to_numpy(dtype=object), na_value))
+    codes = code_map[values.cat.codes.to_numpy()]
+    return pd.Series(pd.Categorical.from_codes(codes, uniques), index=values.index)
+
 def load_data():
     """
     Load the necessary data files from n2c2 and SIDER.
@@ -15,47 +30,64 @@ def load_data():
     
     # Load the cleaned n2c2 data (contains normalized drug and ADE terms)
     # columns expected: drug_norm, ade_norm, source_file
-    n2c2_normalized = pd.read_csv(n2c2_path / 'n2c2_clean.csv')
+    n2c2_normalized = to_categorical(read_table(n2c2_path / 'n2c2_clean.csv', {
+        'drug_norm': 'string', 'ade_norm': 'string', 'source_file': 'string'
+    }))
     
     # Load SIDER side effects data
-    sider_effects = pd.read_csv(sider_path / 'sider_clean.csv')
+    sider_effects = to_categorical(read_table(sider_path / 'sider_clean.csv', {
+        'drug_norm': 'string', 'ade_norm': 'string', 'frequency': 'int32'
+    }))
+
+    # Lowercase and strip the join keys once here, so later steps can use them as-is
+    for col in ['drug_norm', 'ade_norm']:
+        n2c2_normalized[col] = normalize_keys(n2c2_normalized[col], "nan")
+        sider_effects[col] = normalize_keys(sider_effects[col], "")
+
+    # Keep one row per SIDER drug-ADE pair, using the highest frequency
+    # recorded for that pair, so lookups and joins cannot multiply rows
+    sider_effects = (
+        sider_effects
+        .groupby(['drug_norm', 'ade_norm'], as_index=False, observed=True, dropna=False)
+        ['frequency'].max()
+    )
     
     return n2c2_normalized, sider_effects
 
 def check_ade_consistency(n2c2_data, sider_data):
     """
     Check if the ADEs in n2c2 data are consistent with SIDER's documented side effects.
+    Both inputs are expected to carry the normalized keys produced by load_data.
     """
-    # Prepare SIDER lookup sets (lowercased, stripped)
-    sider_data = sider_data.fillna("")
-    sider_drug = sider_data['drug_norm'].astype(str).str.lower().str.strip()
-    sider_ade = sider_data['ade_norm'].astype(str).str.lower().str.strip()
-    sider_pairs = set(zip(sider_drug, sider_ade))
-    sider_drugs_set = set(sider_drug.unique())
-
-    # Normalize n2c2 data fields we'll use
     n2c2_data = n2c2_data.copy()
-    # expect columns: drug_norm, ade_norm
-    n2c2_data['drug_norm'] = n2c2_data['drug_norm'].astype(str).str.lower().str.strip()
-    n2c2_data['ade_norm'] = n2c2_data['ade_norm'].astype(str).str.lower().str.strip()
-
-    # Add columns to track consistency
-    n2c2_data['is_consistent'] = False
-    n2c2_data['sider_match_found'] = False
-
-    # Check each n2c2 entry against SIDER
-    for idx, row in n2c2_data.iterrows():
-        drug = row['drug_norm']
-        ade = row['ade_norm']
-
-        # Check if the drug-ADE pair exists in SIDER
-        if (drug, ade) in sider_pairs:
-            n2c2_data.at[idx, 'is_consistent'] = True
-            n2c2_data.at[idx, 'sider_match_found'] = True
-        else:
-            # Check if the drug exists in SIDER with any side effect
-            drug_exists = drug in sider_drugs_set
-            n2c2_data.at[idx, 'sider_match_found'] = drug_exists
+    sider_drug = sider_data['drug_norm']
+    sider_ade = sider_data['ade_norm']
+
+    # Share one sorted category set per key so the join compares integer codes
+    drug_dtype = pd.CategoricalDtype(
+        sider_drug.cat.categories.union(n2c2_data['drug_norm'].cat.categories))
+    ade_dtype = pd.CategoricalDtype(
+        sider_ade.cat.categories.union(n2c2_data['ade_norm'].cat.categories))
+    sider_drug = sider_drug.astype(drug_dtype)
+    sider_ade = sider_ade.astype(ade_dtype)
+    n2c2_data['drug_norm'] = n2c2_data['drug_norm'].astype(drug_dtype)
+    n2c2_data['ade_norm'] = n2c2_data['ade_norm'].astype(ade_dtype)
+
+    # Look up each drug-ADE pair in SIDER with a single left join; the merge
+    # indicator marks pairs present in SIDER regardless of their frequency
+    sider_pairs = pd.DataFrame({
+        'drug_norm': sider_drug,
+        'ade_norm': sider_ade
+    }).drop_duplicates()
+    merged = n2c2_data[['drug_norm', 'ade_norm']].merge(
+        sider_pairs, on=['drug_norm', 'ade_norm'], how='left', indicator=True)
+
+    # A pair is consistent if it exists in SIDER; otherwise check whether
+    # the drug exists in SIDER with any side effect
+    n2c2_data['is_consistent'] = (merged['_merge'] == 'both').to_numpy()
+    n2c2_data['sider_match_found'] = (
+        n2c2_data['drug_norm'].isin(sider_drug.unique()) | n2c2_data['is_consistent']
+    )
     
     return n2c2_data
 
@@ -71,12 +103,6 @@ def generate_validation_report(validated_data):
     consistency_rate = (consistent_ades / total_ades) * 100
     coverage_rate = (drugs_in_sider / total_ades) * 100
     
-    # Group results by drug to analyze patterns (n2c2 uses 'drug_norm')
-    drug_stats = validated_data.groupby('drug_norm').agg({
-        'is_consistent': ['count', 'sum'],
-        'sider_match_found': 'sum'
-    }).round(2)
-    
     # Save detailed results (add top-of-file comments describing purpose)
     output_path = Path(__file__).parent.parent / 'data' / 'n2c2' / 'processed'
     output_path.mkdir(parents=True, exist_ok=True)
@@ -92,10 +118,11 @@ def generate_validation_report(validated_data):
         # fh.write(f"# Columns: original n2c2 fields plus 'is_consistent' (exact drug-ADE in SIDER) and 'sider_match_found' (drug exists in SIDER).\n")
         # fh.write(f"# Generated: {ts}\n")
         validated_data.to_csv(fh, index=False)
+    write_parquet_cache(validated_data, n2c2_out)
 
-    # Make drug-level stats clearer and write with comments
-    # Flatten and rename aggregated columns for clarity
-    drug_stats = validated_data.groupby('drug_norm').agg(
+    # Group results by drug to analyze patterns (n2c2 uses 'drug_norm'),
+    # computing all per-drug aggregates in a single pass with clear names
+    drug_stats = validated_data.groupby('drug_norm', observed=True).agg(
         n_ades=('is_consistent', 'count'),
         n_consistent=('is_consistent', 'sum'),
         n_drugs_in_sider=('sider_match_found', 'sum')
@@ -8,10 +8,14 @@ Outputs:
 Usage: python scripts/normalize_terms.py
 """
 import os
-import re
 import csv
+import numpy as np
 import pandas as pd
 from pathlib import Path
+from functools import lru_cache, reduce
+from concurrent.futures import ProcessPoolExecutor
+
+from pipeline_io import CSV_READ_KWARGS, STRING_DTYPE, write_csv, write_parquet_cache
 
 try:
     from rapidfuzz import process, fuzz
@@ -25,145 +29,193 @@ except Exception:
         fuzz = None
         _backend = 'none'
 
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
 
-def normalize_text(s: str) -> str:
-    """Normalize text: lowercase, remove punctuation, strip whitespace."""
-    if pd.isna(s):
-        return ''
-    s = str(s)
+# Default fuzzy scorer: a single token-set comparison instead of WRatio's
+# several sub-scorers
+DEFAULT_SCORER = fuzz.token_set_ratio if fuzz is not None else None
+
+
+# Punctuation removed during normalization (hyphens and slashes are kept)
+_PUNCT_TABLE = str.maketrans('', '', '"\'.,;:!?()[]{}')
+
+# Distinct values needed before normalization is split across processes
+PARALLEL_MIN_VALUES = 200_000
+
+# Queries scored per cdist call, so each block's score matrix stays small
+# enough to be reduced from cache before the next block is scored
+QUERY_BLOCK = 4096
+
+
+@lru_cache(maxsize=65536)
+def _norm_cached(s: str) -> str:
+    """normalize_text for a string, cached since the same terms repeat a lot."""
     s = s.lower()
     # Remove punctuation but keep hyphens and slashes
-    s = re.sub(r"[\"\'\.,;:\!\?\(\)\[\]\{\}]", "", s)
+    s = s.translate(_PUNCT_TABLE)
     s = s.strip()
     return s
 
 
-def load_drug_names(path: Path) -> dict:
-    """Load drug_names.tsv and return dict of normalized drug names.
+def normalize_text(s: str) -> str:
+    """Normalize text: lowercase, remove punctuation, strip whitespace."""
+    if pd.isna(s):
+        return ''
+    return _norm_cached(str(s))
+
+
+def _normalize_array(values: np.ndarray) -> np.ndarray:
+    """Vectorized normalize_text over an object array (missing values become '')."""
+    return (
+        pd.Series(values, dtype=object).fillna('').astype(str)
+        .str.lower()
+        .str.translate(_PUNCT_TABLE)
+        .str.strip()
+        .to_numpy(dtype=object)
+    )
+
+
+def vector_normalize(values: pd.Series) -> pd.Series:
+    """Apply normalize_text to a whole Series at once (missing values become '').
     
-    Format: STITCH_ID | drug_name (NOTE: first column is STITCH flat ID, not ATC)
-    Returns: {normalized_name: original_name}
+    Each distinct value is normalized once; large sets of distinct values are
+    split across worker processes.
     """
-    if not path.exists():
-        return {}
+    codes, uniques = pd.factorize(values, use_na_sentinel=False)
+    uniques = np.asarray(uniques, dtype=object)
+    workers = os.cpu_count() or 1
+    if workers > 1 and len(uniques) >= PARALLEL_MIN_VALUES:
+        with ProcessPoolExecutor(workers) as executor:
+            chunks = executor.map(_normalize_array, np.array_split(uniques, workers))
+            normalized = np.concatenate(list(chunks))
+    else:
+        normalized = _normalize_array(uniques)
+    return pd.Series(normalized[codes], index=values.index, dtype=str)
+
+
+def build_name_dict(names: pd.Series) -> dict:
+    """Map normalized names to their first stripped original spelling."""
+    originals = names.dropna().astype(str).str.strip()
+    originals = originals[originals != '']
+    pairs = pd.DataFrame({'normalized': vector_normalize(originals), 'original': originals})
+    pairs = pairs[pairs['normalized'] != ''].drop_duplicates('normalized', keep='first')
+    return dict(zip(pairs['normalized'], pairs['original']))
+
+
+def read_sider_tsv(path: Path, columns: dict):
+    """Read selected columns of a headerless SIDER TSV as strings.
     
-    df = pd.read_csv(path, sep='\t', dtype=str, engine='python', header=None)
+    columns maps column positions to names ({0: 'stitch_id', 1: 'drug_name'});
+    the other columns are skipped by the C parser. The SIDER files are plain
+    TSVs without quoting, so quotes are read literally and empty fields stay
+    empty strings instead of NaN.
     
-    if len(df.columns) < 2:
-        print(f'   WARNING: {path.name} has unexpected format')
-        return {}
+    Returns None if the file has fewer columns than requested.
+    """
+    try:
+        df = pd.read_csv(path, sep='\t', engine='c', header=None, dtype=str,
+                         usecols=list(columns), na_filter=False,
+                         quoting=csv.QUOTE_NONE, on_bad_lines='skip',
+                         compression='infer')
+    except ValueError:
+        return None
+    return df.rename(columns=columns)[list(columns.values())]
+
+
+def read_drug_names(path: Path):
+    """Read drug_names.tsv once for load_drug_names and build_sider_clean.
     
-    df.columns = ['stitch_id', 'drug_name'] + [f'col_{i}' for i in range(2, len(df.columns))]
+    Format: STITCH_ID | drug_name (NOTE: first column is STITCH flat ID, not ATC)
+    Returns: DataFrame with columns stitch_id, drug_name (None if missing or malformed)
+    """
+    if not path.exists():
+        return None
     
-    drug_dict = {}
-    for _, row in df.iterrows():
-        drug_name = row['drug_name']
-        if pd.notna(drug_name) and str(drug_name).strip():
-            normalized = normalize_text(drug_name)
-            if normalized and normalized not in drug_dict:
-                drug_dict[normalized] = str(drug_name).strip()
+    df = read_sider_tsv(path, {0: 'stitch_id', 1: 'drug_name'})
     
-    return drug_dict
+    if df is None:
+        print(f'   WARNING: {path.name} has unexpected format')
+    return df
 
 
-def load_meddra_side_effects(path: Path) -> dict:
-    """Load meddra_all_se.tsv and return dict of side effect names.
+def read_meddra_side_effects(path: Path):
+    """Read meddra_all_se.tsv once for load_meddra_side_effects and build_sider_clean.
     
     Format: STITCH_flat | STITCH_stereo | UMLS_label | MedDRA_type | UMLS_MedDRA | side_effect_name
-    Returns: {normalized_name: original_name}
+    Returns: DataFrame with columns stitch_flat, side_effect (None if missing or malformed)
     """
     if not path.exists():
-        return {}
+        return None
     
-    df = pd.read_csv(path, sep='\t', dtype=str, engine='python', header=None, compression='infer')
+    df = read_sider_tsv(path, {0: 'stitch_flat', 5: 'side_effect'})
     
-    if len(df.columns) < 6:
+    if df is None:
         print(f'   WARNING: {path.name} has unexpected format (expected 6 columns)')
-        return {}
-    
-    df.columns = ['stitch_flat', 'stitch_stereo', 'umls_label', 'meddra_type', 
-                  'umls_meddra', 'side_effect'] + [f'col_{i}' for i in range(6, len(df.columns))]
+    return df
+
+
+def load_drug_names(drug_df: pd.DataFrame) -> dict:
+    """Return dict of normalized drug names from read_drug_names output.
     
-    se_dict = {}
-    for _, row in df.iterrows():
-        se_name = row['side_effect']
-        if pd.notna(se_name) and str(se_name).strip():
-            normalized = normalize_text(se_name)
-            if normalized and normalized not in se_dict:
-                se_dict[normalized] = str(se_name).strip()
+    Returns: {normalized_name: original_name}
+    """
+    if drug_df is None:
+        return {}
+    return build_name_dict(drug_df['drug_name'])
+
+
+def load_meddra_side_effects(meddra_df: pd.DataFrame) -> dict:
+    """Return dict of side effect names from read_meddra_side_effects output.
     
-    return se_dict
+    Returns: {normalized_name: original_name}
+    """
+    if meddra_df is None:
+        return {}
+    return build_name_dict(meddra_df['side_effect'])
 
 
-def build_sider_clean(drug_names_path: Path, meddra_path: Path, 
-                      atc_stitch_path: Path = None) -> pd.DataFrame: # type: ignore
-    """Build SIDER drug-side effect pairs.
+def build_sider_clean(drug_df: pd.DataFrame, meddra_df: pd.DataFrame) -> pd.DataFrame:
+    """Build SIDER drug-side effect pairs from the drug_names and meddra_all_se tables.
     
     The ATC code in drug_names.tsv matches the STITCH flat ID in meddra_all_se.tsv.
     This allows direct joining.
     
     Returns DataFrame with columns: drug_name, side_effect
     """
-    if not drug_names_path.exists() or not meddra_path.exists():
+    if drug_df is None or meddra_df is None:
         return pd.DataFrame(columns=['drug_name', 'side_effect'])
     
-    # Load drug names: ATC_code (STITCH flat ID) -> drug_name
-    drug_df = pd.read_csv(drug_names_path, sep='\t', dtype=str, 
-                          engine='python', header=None)
-    
-    if len(drug_df.columns) < 2:
-        print(f'   WARNING: {drug_names_path.name} has unexpected format')
-        return pd.DataFrame(columns=['drug_name', 'side_effect'])
-    
-    drug_df.columns = ['stitch_id', 'drug_name'] + [f'col_{i}' for i in range(2, len(drug_df.columns))]
-    
-    # Create STITCH ID -> drug name mapping
-    stitch_to_drug = {}
-    for _, row in drug_df.iterrows():
-        stitch_id = str(row['stitch_id']).strip()
-        drug_name = row['drug_name']
-        if pd.notna(drug_name) and str(drug_name).strip():
-            stitch_to_drug[stitch_id] = str(drug_name).strip()
-    
-    # Load meddra: STITCH flat ID -> side effects
-    meddra_df = pd.read_csv(meddra_path, sep='\t', dtype=str, 
-                            engine='python', header=None, compression='infer')
-    
-    if len(meddra_df.columns) < 6:
-        print(f'   WARNING: {meddra_path.name} has unexpected format (expected 6 columns)')
-        return pd.DataFrame(columns=['drug_name', 'side_effect'])
-    
-    meddra_df.columns = ['stitch_flat', 'stitch_stereo', 'umls_label', 'meddra_type',
-                         'umls_meddra', 'side_effect'] + [f'col_{i}' for i in range(6, len(meddra_df.columns))]
+    # Keep STITCH IDs with a drug name (a later row for the same ID wins)
+    drugs = drug_df.dropna(subset=['drug_name'])
+    drugs = drugs.assign(
+        stitch_id=drugs['stitch_id'].astype(str).str.strip(),
+        drug_name=drugs['drug_name'].str.strip()
+    )
+    drugs = drugs[drugs['drug_name'] != ''].drop_duplicates('stitch_id', keep='last')
+    drugs = drugs.assign(drug_norm=vector_normalize(drugs['drug_name']))
+    
+    # Keep one row per (STITCH ID, normalized side effect) so the join does
+    # not multiply rows that the final drop_duplicates would discard anyway
+    meddra = meddra_df.dropna(subset=['side_effect'])
+    meddra = pd.DataFrame({
+        'stitch_flat': meddra['stitch_flat'].astype(str).str.strip(),
+        'ade_norm': vector_normalize(meddra['side_effect'])
+    })
+    meddra = meddra[meddra['ade_norm'] != ''].drop_duplicates()
     
     # Build drug-side effect pairs by joining on STITCH ID
-    pairs = []
-    for _, row in meddra_df.iterrows():
-        stitch_flat = str(row['stitch_flat']).strip()
-        se = row['side_effect']
-        
-        if pd.isna(se) or not str(se).strip():
-            continue
-        
-        # Look up drug name using STITCH flat ID
-        drug_name = stitch_to_drug.get(stitch_flat)
-        
-        if drug_name:
-            drug_norm = normalize_text(drug_name)
-            se_norm = normalize_text(se)
-
-            if drug_norm and se_norm:
-                pairs.append({
-                    'drug_norm': drug_norm,
-                    'ade_norm': se_norm
-                })
+    joined = meddra.merge(drugs, left_on='stitch_flat', right_on='stitch_id', how='inner')
+    df_pairs = joined[['drug_norm', 'ade_norm']]
+    df_pairs = df_pairs[(df_pairs['drug_norm'] != '') & (df_pairs['ade_norm'] != '')]
     
-    df_pairs = pd.DataFrame(pairs)
-    if len(df_pairs) > 0:
-        # drop exact duplicates before counting frequency
-        df_pairs = df_pairs.drop_duplicates()
+    # drop exact duplicates before counting frequency
+    df_pairs = df_pairs.drop_duplicates()
     
-    print(f'   Successfully joined {len(stitch_to_drug)} drugs with side effects')
+    print(f'   Successfully joined {len(drugs)} drugs with side effects')
     
     return df_pairs
 
@@ -173,30 +225,30 @@ def build_sider_with_mapping(drug_names_path: Path, meddra_path: Path,
     """Build actual SIDER drug-SE pairs using ATC-STITCH mapping."""
     
     # Load ATC to STITCH mapping
-    atc_stitch_df = pd.read_csv(atc_stitch_path, sep='\t', dtype=str, 
-                                 engine='python', header=None)
-    atc_stitch_df.columns = ['stitch', 'atc'] + [f'col_{i}' for i in range(2, len(atc_stitch_df.columns))]
+    atc_stitch_df = read_sider_tsv(atc_stitch_path, {0: 'stitch', 1: 'atc'})
     
     # Load drug names (ATC -> drug name)
-    drug_df = pd.read_csv(drug_names_path, sep='\t', dtype=str, 
-                          engine='python', header=None)
-    drug_df.columns = ['atc', 'drug_name'] + [f'col_{i}' for i in range(2, len(drug_df.columns))]
+    drug_df = read_sider_tsv(drug_names_path, {0: 'atc', 1: 'drug_name'})
     
     # Load meddra (STITCH -> side effect)
-    meddra_df = pd.read_csv(meddra_path, sep='\t', dtype=str, 
-                            engine='python', header=None, compression='infer')
-    meddra_df.columns = ['stitch_flat', 'stitch_stereo', 'umls_label', 'meddra_type',
-                         'umls_meddra', 'side_effect'] + [f'col_{i}' for i in range(6, len(meddra_df.columns))]
+    meddra_df = read_sider_tsv(meddra_path, {0: 'stitch_flat', 5: 'side_effect'})
+    
+    if atc_stitch_df is None or drug_df is None or meddra_df is None:
+        print('   WARNING: SIDER files have unexpected format')
+        return pd.DataFrame(columns=['drug_name', 'side_effect'])
+    
+    # Each (STITCH ID, side effect) pair only needs to be mapped once
+    meddra_df = meddra_df.drop_duplicates()
     
     # Create mappings
     atc_to_drug = dict(zip(drug_df['atc'], drug_df['drug_name']))
     stitch_to_atc = dict(zip(atc_stitch_df['stitch'], atc_stitch_df['atc']))
     
-    # Build pairs
-    pairs = []
-    for _, row in meddra_df.iterrows():
-        stitch_flat = str(row['stitch_flat'])
-        se = row['side_effect']
+    # Build pairs column-wise
+    drug_out = []
+    se_out = []
+    for stitch_flat, se in meddra_df[['stitch_flat', 'side_effect']].itertuples(index=False, name=None):
+        stitch_flat = str(stitch_flat)
         
         if pd.isna(se) or not str(se).strip():
             continue
@@ -209,31 +261,66 @@ def build_sider_with_mapping(drug_names_path: Path, meddra_path: Path,
                 drug_norm = normalize_text(drug_name)
                 se_norm = normalize_text(se)
                 if drug_norm and se_norm:
-                    pairs.append({
-                        'drug_name': drug_norm,
-                        'side_effect': se_norm
-                    })
+                    drug_out.append(drug_norm)
+                    se_out.append(se_norm)
+    
+    return pd.DataFrame({'drug_name': drug_out, 'side_effect': se_out}).drop_duplicates()
+
+
+def build_substring_index(choices) -> tuple:
+    """Lookups for substring_match: ({choice: position}, trigram index)."""
+    return {choice: i for i, choice in enumerate(choices)}, build_trigram_index(choices)
+
+
+def substring_match(term: str, choices, substring_index: tuple) -> int:
+    """Position of the first choice that contains term or is contained in it (-1 if none)."""
+    positions, trigram_index = substring_index
+    
+    # Choices contained in the term are among its substrings
+    found = [positions[term[i:j]] for i in range(len(term))
+             for j in range(i + 1, len(term) + 1) if term[i:j] in positions]
     
-    return pd.DataFrame(pairs).drop_duplicates()
+    # Choices containing the term contain all of its trigrams
+    grams = {term[i:i + 3] for i in range(len(term) - 2)}
+    if not grams:
+        candidates = range(len(choices))
+    elif all(gram in trigram_index for gram in grams):
+        candidates = reduce(np.intersect1d, (trigram_index[gram] for gram in grams))
+    else:
+        candidates = []
+    first = next((i for i in candidates if term in choices[i]), None)
+    if first is not None:
+        found.append(first)
+    
+    return min(found, default=-1)
 
 
-def fuzzy_match(term: str, reference_dict: dict, threshold=85):
+def fuzzy_match(term: str, choices: list, reference_dict: dict, threshold=85, scorer=None,
+                substring_index=None):
     """Fuzzy match a term against a reference dictionary.
     
     Args:
         term: normalized term to match
+        choices: list(reference_dict.keys()), built once by the caller
         reference_dict: {normalized: original} mapping
         threshold: minimum match score
+        scorer: fuzz scorer to use (default: DEFAULT_SCORER)
+        substring_index: build_substring_index(choices) for the no-backend
+            fallback, built per call if not given
     
     Returns: (matched_normalized, matched_original, score)
     """
     if not term or not reference_dict:
         return '', '', 0
     
-    choices = list(reference_dict.keys())
+    # Exact normalized hits need no fuzzy scoring
+    if term in reference_dict:
+        return term, reference_dict[term], 100
+    
+    scorer = scorer or DEFAULT_SCORER
     
     if _backend == 'rapidfuzz':
-        res = process.extractOne(term, choices, scorer=fuzz.WRatio) # type: ignore
+        res = process.extractOne(term, choices, scorer=scorer) # type: ignore
         if not res:
             return '', '', 0
         match_norm, score, _idx = res # type: ignore
@@ -242,7 +329,7 @@ def fuzzy_match(term: str, reference_dict: dict, threshold=85):
         return '', '', int(score)
     
     elif _backend == 'fuzzywuzzy':
-        res = process.extractOne(term, choices, scorer=fuzz.WRatio) # type: ignore
+        res = process.extractOne(term, choices, scorer=scorer) # type: ignore
         if not res:
             return '', '', 0
         match_norm, score = res # type: ignore
@@ -251,15 +338,132 @@ def fuzzy_match(term: str, reference_dict: dict, threshold=85):
         return '', '', int(score)
     
     else:
-        # Fallback: exact match
-        if term in reference_dict:
-            return term, reference_dict[term], 100
-        for choice in choices:
-            if term in choice or choice in term:
-                return choice, reference_dict[choice], 80
+        # Fallback: substring match
+        if substring_index is None:
+            substring_index = build_substring_index(choices)
+        pos = substring_match(term, choices, substring_index)
+        if pos >= 0:
+            return choices[pos], reference_dict[choices[pos]], 80
         return '', '', 0
 
 
+def _trigrams(term: str) -> set:
+    """Character trigrams of a space-padded term."""
+    padded = f' {term} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def build_trigram_index(choices) -> dict:
+    """Map each character trigram to the sorted indices of the choices containing it."""
+    index = {}
+    for i, choice in enumerate(choices):
+        for gram in _trigrams(choice):
+            index.setdefault(gram, []).append(i)
+    return {gram: np.array(idx, dtype=np.intp) for gram, idx in index.items()}
+
+
+def _row_best(scores: np.ndarray, out_idx: np.ndarray, out_score: np.ndarray) -> None:
+    """Write the first best column and its score for each row of a score matrix."""
+    out_idx[:] = scores.argmax(axis=1)
+    out_score[:] = scores[np.arange(len(out_idx)), out_idx]
+
+
+if HAS_NUMBA:
+    @njit(parallel=True)
+    def _row_best(scores, out_idx, out_score):
+        # Same result as argmax + gather, in a single sweep per row
+        for i in prange(scores.shape[0]):
+            best = 0
+            best_score = scores[i, 0]
+            for j in range(1, scores.shape[1]):
+                if scores[i, j] > best_score:
+                    best = j
+                    best_score = scores[i, j]
+            out_idx[i] = best
+            out_score[i] = best_score
+
+
+def match_terms(terms: list, reference_dict: dict, threshold=85, scorer=None, prefilter=True):
+    """Fuzzy match a batch of terms against a reference dictionary.
+    
+    Terms found in reference_dict as-is are exact hits (score 100). With
+    rapidfuzz, each distinct remaining term is scored once: by default only
+    against the choices sharing a character trigram with it (a term with no
+    such choice gets score 0), or with prefilter=False against all choices
+    with multithreaded cdist calls, QUERY_BLOCK terms at a time. Other
+    backends fall back to fuzzy_match per term.
+    
+    Returns: (matched_normalized, matched_original, scores) arrays aligned with terms,
+    scores as uint8
+    """
+    if _backend != 'rapidfuzz':
+        choices = list(reference_dict.keys())
+        substring_index = build_substring_index(choices) if _backend == 'none' else None
+        results = [fuzzy_match(t, choices, reference_dict, threshold=threshold, scorer=scorer,
+                               substring_index=substring_index)
+                   for t in terms]
+        matched_norm, matched_orig, scores = zip(*results) if results else ((), (), ())
+        return (np.array(matched_norm, dtype=object), np.array(matched_orig, dtype=object),
+                np.array(scores, dtype=np.uint8))
+    
+    terms = np.asarray(terms, dtype=object)
+    matched_norm = np.full(len(terms), '', dtype=object)
+    matched_orig = np.full(len(terms), '', dtype=object)
+    scores = np.zeros(len(terms), dtype=np.uint8)
+    
+    if not reference_dict or len(terms) == 0:
+        return matched_norm, matched_orig, scores
+    
+    # Exact hits are filled straight from the dictionary
+    exact_orig = pd.Series(terms).map(reference_dict).to_numpy(dtype=object)
+    exact = pd.notna(exact_orig)
+    matched_norm[exact] = terms[exact]
+    matched_orig[exact] = exact_orig[exact]
+    scores[exact] = 100
+    
+    # Empty terms never match, same as in fuzzy_match
+    query_idx = np.flatnonzero((terms != '') & ~exact)
+    if len(query_idx) == 0:
+        return matched_norm, matched_orig, scores
+    
+    choices = np.array(list(reference_dict.keys()), dtype=object)
+    originals = np.array(list(reference_dict.values()), dtype=object)
+    scorer = scorer or DEFAULT_SCORER
+    
+    # Score each distinct miss once and expand back to all of its rows
+    codes, queries = pd.factorize(terms[query_idx])
+    queries = np.asarray(queries, dtype=object)
+    best = np.empty(len(queries), dtype=np.intp)
+    best_scores = np.empty(len(queries), dtype=np.float64)
+    if prefilter:
+        # Only score the choices that share at least one trigram with the term
+        index = build_trigram_index(choices)
+        for i, query in enumerate(queries):
+            postings = [index[gram] for gram in _trigrams(query) if gram in index]
+            if not postings:
+                best[i], best_scores[i] = 0, 0
+                continue
+            candidates = np.unique(np.concatenate(postings))
+            _match, score, pos = process.extractOne(query, choices[candidates].tolist(), # type: ignore
+                                                    scorer=scorer)
+            best[i], best_scores[i] = candidates[pos], score
+    else:
+        for start in range(0, len(queries), QUERY_BLOCK):
+            block = slice(start, start + QUERY_BLOCK)
+            score_block = process.cdist(queries[block], choices, scorer=scorer, # type: ignore
+                                        dtype=np.float64, workers=-1)
+            _row_best(score_block, best[block], best_scores[block])
+    
+    best = best[codes]
+    best_scores = best_scores[codes]
+    hits = best_scores >= threshold
+    matched_norm[query_idx[hits]] = choices[best[hits]]
+    matched_orig[query_idx[hits]] = originals[best[hits]]
+    scores[query_idx] = best_scores.astype(np.uint8)
+    
+    return matched_norm, matched_orig, scores
+
+
 def main():
     base = Path(__file__).resolve().parents[1]
     n2c2_in = base / 'data' / 'n2c2' / 'processed' / 'ade_drug_relations.csv'
@@ -271,22 +475,26 @@ def main():
 
     drug_names_path = base / 'data' / 'sider' / 'raw' / 'drug_names.tsv'
     meddra_path = base / 'data' / 'sider' / 'raw' / 'meddra_all_se.tsv'
-    atc_stitch_path = base / 'data' / 'sider' / 'raw' / 'drug_atc.tsv'
 
     print(f'Normalization script: backend = {_backend}')
+    if _backend == 'none':
+        print('   WARNING: no fuzzy matching backend installed (pip install rapidfuzz); '
+              'falling back to exact and substring matching')
     print('='*60)
 
     # ========== STEP 1: Load reference dictionaries ==========
     print('\n[1] Loading SIDER reference dictionaries...')
-    drug_dict = load_drug_names(drug_names_path)
-    se_dict = load_meddra_side_effects(meddra_path)
+    drug_df = read_drug_names(drug_names_path)
+    meddra_df = read_meddra_side_effects(meddra_path)
+    drug_dict = load_drug_names(drug_df)
+    se_dict = load_meddra_side_effects(meddra_df)
     
     print(f'   Loaded {len(drug_dict)} unique drug names')
     print(f'   Loaded {len(se_dict)} unique side effect names')
 
     # ========== STEP 2: Build SIDER clean dataset ==========
     print('\n[2] Building SIDER clean dataset...')
-    sider_pairs = build_sider_clean(drug_names_path, meddra_path, atc_stitch_path)
+    sider_pairs = build_sider_clean(drug_df, meddra_df)
 
     sider_out_dir = base / 'data' / 'sider' / 'processed'
     sider_out_dir.mkdir(parents=True, exist_ok=True)
@@ -304,7 +512,8 @@ def main():
         freq_df = pd.DataFrame(columns=['drug_norm', 'ade_norm', 'frequency'])
 
     # Write the SIDER clean file with explicit columns: drug_norm, ade_norm, frequency
-    freq_df.to_csv(sider_out, index=False)
+    write_csv(freq_df, sider_out)
+    write_parquet_cache(freq_df, sider_out)
 
     valid_pairs = freq_df[(freq_df['drug_norm'] != '') & (freq_df['ade_norm'] != '')]
     print(f'   Wrote {len(valid_pairs)} drug-side effect pairs to {sider_out}')
@@ -319,7 +528,7 @@ def main():
         print(f'   ERROR: n2c2 relations file not found at {n2c2_in}')
         return
 
-    df = pd.read_csv(n2c2_in, dtype=str)
+    df = pd.read_csv(n2c2_in, dtype='string', **CSV_READ_KWARGS)
     print(f'   Loaded {len(df)} relations from {n2c2_in.name}')
 
     # Identify drug and ADE columns
@@ -341,38 +550,16 @@ def main():
     
     print(f'   Using columns: drug="{drug_col}", ade="{ade_col}"')
 
-    # Normalize and match
-    norm_drugs = []
-    norm_ades = []
-    matched_drugs = []
-    matched_drug_originals = []
-    matched_ades = []
-    matched_ade_originals = []
-    drug_scores = []
-    ade_scores = []
-
-    for _, row in df.iterrows():
-        raw_drug = row.get(drug_col, '')
-        raw_ade = row.get(ade_col, '')
-        
-        # Normalize
-        nd = normalize_text(raw_drug)
-        na = normalize_text(raw_ade)
-        
-        # Match drugs against drug dictionary ONLY
-        match_d_norm, match_d_orig, ds = fuzzy_match(nd, drug_dict, threshold=85)
-        
-        # Match ADEs against side effect dictionary ONLY
-        match_a_norm, match_a_orig, ascore = fuzzy_match(na, se_dict, threshold=85)
-        
-        norm_drugs.append(nd)
-        norm_ades.append(na)
-        matched_drugs.append(match_d_norm)
-        matched_drug_originals.append(match_d_orig)
-        matched_ades.append(match_a_norm)
-        matched_ade_originals.append(match_a_orig)
-        drug_scores.append(ds)
-        ade_scores.append(ascore)
+    # Normalize each column in one vectorized pass (the dictionary keys are
+    # already normalized, so the arrays go straight to the matcher)
+    norm_drugs = vector_normalize(df[drug_col]).to_numpy(dtype=object)
+    norm_ades = vector_normalize(df[ade_col]).to_numpy(dtype=object)
+    
+    # Match drugs against drug dictionary ONLY
+    matched_drugs, matched_drug_originals, drug_scores = match_terms(norm_drugs, drug_dict, threshold=85)
+    
+    # Match ADEs against side effect dictionary ONLY
+    matched_ades, matched_ade_originals, ade_scores = match_terms(norm_ades, se_dict, threshold=85)
 
     df['drug_normalized'] = norm_drugs
     df['ade_normalized'] = norm_ades
@@ -382,13 +569,16 @@ def main():
     df['ade_matched_original'] = matched_ade_originals
     df['drug_match_score'] = drug_scores
     df['ade_match_score'] = ade_scores
+    df = df.astype(dict.fromkeys(['drug_normalized', 'ade_normalized', 'drug_matched',
+                                  'drug_matched_original', 'ade_matched',
+                                  'ade_matched_original'], STRING_DTYPE))
 
     # Output
     n2c2_out_dir = base / 'data' / 'n2c2' / 'processed'
     n2c2_out_dir.mkdir(parents=True, exist_ok=True)
     n2c2_out = n2c2_out_dir / 'n2c2_normalized.csv'
     
-    df.to_csv(n2c2_out, index=False)
+    df.to_csv(n2c2_out, index=False, chunksize=100_000)
     print(f'   Wrote {n2c2_out}')
 
     # ========== STEP 4: Summary ==========
@@ -396,15 +586,15 @@ def main():
     print('='*60)
     print(f'Total n2c2 relations: {len(df)}')
     
-    high_drug_matches = sum(1 for v in df['drug_match_score'] if int(v) >= 85)
-    high_ade_matches = sum(1 for v in df['ade_match_score'] if int(v) >= 85)
+    high_drug = df['drug_match_score'] >= 85
+    high_ade = df['ade_match_score'] >= 85
+    high_drug_matches = int(high_drug.sum())
+    high_ade_matches = int(high_ade.sum())
     
     print(f'Drugs matched (score ≥85): {high_drug_matches} ({high_drug_matches/len(df)*100:.1f}%)')
     print(f'ADEs matched (score ≥85): {high_ade_matches} ({high_ade_matches/len(df)*100:.1f}%)')
     
-    both_matched = sum(1 for i in range(len(df)) 
-                      if int(df.iloc[i]['drug_match_score']) >= 85 
-                      and int(df.iloc[i]['ade_match_score']) >= 85)
+    both_matched = int((high_drug & high_ade).sum())
     print(f'Both matched (score ≥85): {both_matched} ({both_matched/len(df)*100:.1f}%)')
     print('='*60)
 
@@ -0,0 +1,76 @@
+"""Shared CSV/Parquet I/O helpers for the pipeline scripts.
+
+Each pipeline stage writes its CSV output as before and, when pyarrow is
+installed, a Parquet copy next to it (same name, .parquet suffix) with the
+repeated string columns stored as categoricals. Later stages load the Parquet
+copy in preference to re-parsing the CSV, as long as it is not older than
+the CSV.
+"""
+
+from pathlib import Path
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+# Use the multithreaded pyarrow CSV reader when it is installed
+CSV_READ_KWARGS = {'engine': 'pyarrow', 'dtype_backend': 'pyarrow'} if HAS_PYARROW else {}
+
+# Arrow-backed strings (one contiguous buffer per column) when available
+STRING_DTYPE = 'string[pyarrow]' if HAS_PYARROW else 'string'
+
+# Low-cardinality string columns stored as categoricals in the Parquet cache
+CATEGORICAL_COLUMNS = ['drug_norm', 'ade_norm', 'source_file']
+
+
+def read_table(csv_path: Path, dtypes: dict = None) -> pd.DataFrame: # type: ignore
+    """Load a pipeline table, preferring an up-to-date Parquet copy of the CSV.
+    
+    If dtypes ({column: dtype}) is given, only those columns are read and the
+    CSV parser skips type inference for them.
+    """
+    csv_path = Path(csv_path)
+    parquet_path = csv_path.with_suffix('.parquet')
+    usecols = list(dtypes) if dtypes else None
+    if HAS_PYARROW and parquet_path.exists() and (
+            not csv_path.exists()
+            or parquet_path.stat().st_mtime >= csv_path.stat().st_mtime):
+        return pd.read_parquet(parquet_path, columns=usecols)
+    return pd.read_csv(csv_path, usecols=usecols, dtype=dtypes, **CSV_READ_KWARGS)
+
+
+def to_categorical(df: pd.DataFrame) -> pd.DataFrame:
+    """Convert the repeated string columns of a pipeline table to categoricals."""
+    categorical = {col: 'category' for col in CATEGORICAL_COLUMNS if col in df.columns}
+    return df.astype(categorical)
+
+
+def write_csv(df: pd.DataFrame, csv_path: Path) -> None:
+    """Write df as df.to_csv(index=False) would, using the pyarrow writer when possible.
+    
+    The pyarrow writer is only used unquoted, so the file is byte-identical to
+    the pandas output; if any value needs quoting, pandas writes the file.
+    """
+    if HAS_PYARROW:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        options = pacsv.WriteOptions(include_header=False, quoting_style='none')
+        try:
+            with open(csv_path, 'wb') as f:
+                f.write((','.join(df.columns) + '\n').encode())
+                pacsv.write_csv(table, f, write_options=options)
+            return
+        except pa.ArrowInvalid:
+            pass
+    df.to_csv(csv_path, index=False, chunksize=200_000)
+
+
+def write_parquet_cache(df: pd.DataFrame, csv_path: Path) -> None:
+    """Write a Parquet copy of a table that was just saved to csv_path."""
+    if not HAS_PYARROW:
+        return
+    to_categorical(df).to_parquet(Path(csv_path).with_suffix('.parquet'), index=False)